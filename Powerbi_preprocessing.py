@@ -1,16 +1,263 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit, prange, get_num_threads
 from datetime import datetime
+import hashlib
+import os
+import re
+import logging
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                 'Friday', 'Saturday', 'Sunday']
+# Known statuses come first so their category codes are fixed
+STATUS_CATEGORIES = ['Active', 'Completed', 'Returned', 'Cancelled']
+NS_PER_DAY = 86_400 * 1_000_000_000
+PROFIT_MARGIN = 0.30
+# Shipment files above this size (roughly a million rows) are large enough
+# for the multi-threaded Polars engine to pay off
+LARGE_SHIPMENT_BYTES = 128 * 1024 * 1024
+
+
+def read_csv_arrow(path, column_types=None):
+    """Read a CSV file with PyArrow's multi-threaded reader into Arrow-backed columns"""
+    table = pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(delimiter=','),
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            timestamp_parsers=['%d/%m/%Y'],
+            # Blank cells are missing values, as they were with pandas
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True
+        )
+    )
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def arrow_to_pandas(table):
+    """Convert an Arrow table to Arrow-backed columns, with dictionaries as categoricals"""
+    # Plain strings, as the CSV reader produces, rather than large_string
+    table = table.cast(pa.schema([
+        field.with_type(pa.string()) if pa.types.is_large_string(field.type) else field
+        for field in table.schema
+    ], metadata=table.schema.metadata))
+    df = table.to_pandas(
+        types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t)
+    )
+    # Columns written from NumPy or nullable pandas dtypes get those back
+    for column in (table.schema.pandas_metadata or {}).get('columns', []):
+        if column['name'] in df and column['pandas_type'] != 'categorical' \
+                and not column['numpy_type'].endswith('[pyarrow]'):
+            df[column['name']] = df[column['name']].astype(column['numpy_type'])
+    return df
+
+
+def needs_quoting(table):
+    """Whether any header or text value of an Arrow table contains CSV structural characters"""
+    pattern = '[,"\r\n]'
+    if pc.any(pc.match_substring_regex(pa.array(table.column_names, pa.string()), pattern)).as_py():
+        return True
+    for column in table.columns:
+        for chunk in column.chunks:
+            # Categoricals only need their dictionary checked
+            values = chunk.dictionary if pa.types.is_dictionary(chunk.type) else chunk
+            if (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)) \
+                    and pc.any(pc.match_substring_regex(values, pattern)).as_py():
+                return True
+    return False
+
+
+def write_table(df, path, formats, row_group_size=None):
+    """Write a DataFrame to path.csv and/or path.parquet, converting it to Arrow once"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if 'parquet' in formats:
+        pq.write_table(table, f'{path}.parquet', compression='snappy',
+                       row_group_size=row_group_size)
+    if 'csv' in formats:
+        # Keep pandas' to_csv text so Power BI infers the same column types:
+        # dates without a time part (they are day-resolution throughout),
+        # whole floats with a trailing .0, and booleans as True/False
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if pa.types.is_timestamp(field.type):
+                column = column.cast(pa.date32())
+            elif pa.types.is_floating(field.type):
+                column = pc.replace_substring_regex(column.cast(pa.string()),
+                                                    r'^(-?\d+)$', r'\1.0')
+            elif pa.types.is_boolean(field.type):
+                column = pc.if_else(column, 'True', 'False')
+            else:
+                continue
+            table = table.set_column(i, field.name, column)
+        # Arrow's 'needed' style quotes every string; when no header or value
+        # contains a delimiter, quote or line break, write them bare like
+        # pandas' to_csv did
+        quoting = 'needed' if needs_quoting(table) else 'none'
+        pacsv.write_csv(table, f'{path}.csv',
+                        write_options=pacsv.WriteOptions(quoting_style=quoting,
+                                                         quoting_header=quoting))
+
+
+def parse_dates(values, date_format):
+    """Parse date strings, converting each distinct string only once (NaT where invalid)"""
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(uniques, format=date_format, errors='coerce')
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=values.index)
+
+
+def null_counts(df):
+    """Missing values per column, read from Arrow validity bitmaps where available"""
+    return pd.Series({
+        col: pa.chunked_array(df[col]).null_count
+        if isinstance(df[col].dtype, pd.ArrowDtype) else int(df[col].isna().sum())
+        for col in df.columns
+    }, dtype=np.int64)
+
+
+def strip_whitespace(df, columns):
+    """Trim whitespace from string columns with Arrow's vectorized kernel"""
+    for col in columns:
+        # An all-empty column is inferred as Arrow's null type; trim it as text
+        trimmed = pc.utf8_trim_whitespace(pa.array(df[col]).cast(pa.string()))
+        df[col] = pd.arrays.ArrowExtensionArray(trimmed)
+    return df
+
+
+def encode_status(values):
+    """Status as a Categorical with the known statuses first, so their codes are fixed"""
+    status = pd.Categorical(values)
+    others = [c for c in status.categories if c not in STATUS_CATEGORIES]
+    return status.set_categories(STATUS_CATEGORIES + others)
+
+
+def lookup_columns(keys, lookup_df, key):
+    """Fetch the lookup_df columns matching each key of a Categorical, missing where unmatched"""
+    # Find each category's row in the lookup table once, then index those
+    # rows by the key codes; the first row wins for a repeated key
+    lookup_df = lookup_df.drop_duplicates(key)
+    category_rows = pd.Index(lookup_df[key]).get_indexer(keys.categories)
+    rows = np.where(keys.codes >= 0, category_rows[keys.codes], -1)
+    return {
+        col: pd.api.extensions.take(lookup_df[col].array, rows, allow_fill=True)
+        for col in lookup_df.columns if col != key
+    }
+
+
+def add_revenue_profit(df):
+    """Add Revenue (Sales * Cost per Box) and Profit (assuming 30% margin) columns"""
+    revenue, profit = revenue_profit(
+        df['Sales'].to_numpy(dtype=np.float64, na_value=np.nan),
+        df['Cost per Box'].to_numpy(dtype=np.float64, na_value=np.nan),
+        PROFIT_MARGIN
+    )
+    return df.assign(Revenue=revenue, Profit=profit)
+
+
+def factorize_keys(df, keys):
+    """Dense group ids over several key columns, and the first row of each group"""
+    # Combine one key at a time, re-densifying so the ids never overflow;
+    # missing values form their own group like groupby(dropna=False)
+    group_ids = np.zeros(len(df), np.int64)
+    for key in keys:
+        codes, uniques = pd.factorize(df[key], use_na_sentinel=False)
+        group_ids, _ = pd.factorize(group_ids * len(uniques) + codes)
+    # factorize numbers groups in order of appearance, so a group starts
+    # wherever the running maximum id grows
+    running = np.maximum.accumulate(group_ids)
+    first_rows = np.flatnonzero(np.diff(running, prepend=-1) > 0)
+    return group_ids, first_rows
+
+
+@njit(cache=True, parallel=True)
+def grouped_sums(group_ids, n_groups, values, n_threads):
+    """Per-group sums of each column of a 2-D float array, skipping NaN"""
+    n, m = values.shape
+    # Each thread fills its own bins, merged at the end; fewer chunks when
+    # the bins would be as large as the data itself
+    n_chunks = max(1, min(n_threads, n // max(n_groups, 1)))
+    chunk_size = (n + n_chunks - 1) // n_chunks
+    partial = np.zeros((n_chunks, n_groups, m))
+    for c in prange(n_chunks):
+        for i in range(c * chunk_size, min(n, (c + 1) * chunk_size)):
+            g = group_ids[i]
+            for j in range(m):
+                v = values[i, j]
+                if not np.isnan(v):
+                    partial[c, g, j] += v
+    return partial.sum(axis=0)
+
+
+@njit(cache=True)
+def column_stats(values):
+    """Min, max, sum and NaN count of a float array in a single pass (NaN min/max if empty)"""
+    lo = np.inf
+    hi = -np.inf
+    total = 0.0
+    nan_count = 0
+    for v in values:
+        if np.isnan(v):
+            nan_count += 1
+        else:
+            lo = min(lo, v)
+            hi = max(hi, v)
+            total += v
+    if nan_count == values.size:
+        lo = hi = np.nan
+    return lo, hi, total, nan_count
+
+
+@njit(cache=True, parallel=True)
+def delivery_days(delivered_ns, date_ns, nat):
+    """Whole days between two int64 nanosecond arrays, 0 where either date is missing"""
+    n = delivered_ns.size
+    out = np.empty(n, np.int32)
+    for i in prange(n):
+        d = delivered_ns[i]
+        start = date_ns[i]
+        out[i] = 0 if d == nat or start == nat else (d - start) // NS_PER_DAY
+    return out
+
+
+@njit(cache=True, parallel=True)
+def revenue_profit(sales, cost, margin):
+    """Revenue (sales * cost) and profit (revenue * margin) in one pass"""
+    n = sales.size
+    revenue = np.empty(n)
+    profit = np.empty(n)
+    for i in prange(n):
+        r = sales[i] * cost[i]
+        revenue[i] = r
+        profit[i] = r * margin
+    return revenue, profit
+
+
 class PowerBIDataPreprocessor:
     """
     Complete preprocessing pipeline for Power BI Logistics Dashboard
     Handles cleaning, transformation, and feature engineering
     """
     
-    def __init__(self):
+    def __init__(self, silent=False, engine='pandas', cache_dir=None):
+        # Progress is reported through logging; silent keeps only warnings.
+        # The level is left alone otherwise, so the caller's config applies
+        if silent:
+            logger.setLevel(logging.WARNING)
+        if engine not in ('auto', 'pandas', 'polars'):
+            raise ValueError(f"Unknown engine: {engine!r} (expected 'auto', 'pandas' or 'polars')")
+        self.engine = engine
+        # Cleaned tables are cached here as Arrow IPC files when set
+        self.cache_dir = cache_dir
         self.salesperson_df = None
         self.shipment_df = None
         self.country_df = None
@@ -18,196 +265,291 @@ class PowerBIDataPreprocessor:
         
     def load_data(self, salesperson_path, shipment_path, country_path, product_path):
         """Load all CSV files"""
-        print("Loading data files...")
-        self.salesperson_df = pd.read_csv(salesperson_path)
-        self.shipment_df = pd.read_csv(shipment_path)
-        self.country_df = pd.read_csv(country_path)
-        self.product_df = pd.read_csv(product_path)
-        print("✓ Data loaded successfully\n")
-        
+        logger.info("Loading data files...")
+        # The files are independent and Arrow releases the GIL while parsing,
+        # so read them concurrently
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            futures = {
+                # Picture is typed as text so an all-blank column can still be filled
+                'salesperson': ex.submit(read_csv_arrow, salesperson_path, {
+                    'Picture': pa.string()
+                }),
+                # Date and Sales are typed up front so Arrow parses them while reading
+                'shipment': ex.submit(read_csv_arrow, shipment_path, {
+                    'Date': pa.timestamp('ns'),
+                    'Sales': pa.float64()
+                }),
+                'country': ex.submit(read_csv_arrow, country_path),
+                'product': ex.submit(read_csv_arrow, product_path)
+            }
+        
+        self.salesperson_df = futures['salesperson'].result()
+        self.shipment_df = futures['shipment'].result()
+        self.country_df = futures['country'].result()
+        self.product_df = futures['product'].result()
+        logger.info("✓ Data loaded successfully")
+        
+    def cache_files(self, paths):
+        """Arrow IPC cache file for each cleaned table, keyed on the input files"""
+        # Any change to an input file, or to this module, gives a new key
+        key = hashlib.blake2s(b''.join(
+            f'{p}{os.path.getmtime(p)}{os.path.getsize(p)}'.encode()
+            for p in [*paths, __file__]
+        )).hexdigest()
+        return {
+            name: os.path.join(self.cache_dir, f'{key}_{name}.arrow')
+            for name in ['salesperson', 'shipment', 'country', 'product']
+        }
+    
+    def load_cached_data(self, paths):
+        """Load cleaned tables from the cache; returns False on a cache miss"""
+        files = self.cache_files(paths)
+        if not all(os.path.exists(path) for path in files.values()):
+            return False
+        tables = {}
+        for name, path in files.items():
+            # Memory-mapped, so the Arrow buffers are not copied on read
+            try:
+                with pa.memory_map(path) as source:
+                    tables[name] = arrow_to_pandas(pa.ipc.open_file(source).read_all())
+            except (OSError, pa.ArrowException) as e:
+                logger.warning(f"Unreadable cache file {path} ({e}); reloading")
+                return False
+        for name, df in tables.items():
+            setattr(self, f'{name}_df', df)
+        logger.info("✓ Cleaned data loaded from cache")
+        return True
+    
+    def store_cached_data(self, paths):
+        """Write the cleaned tables to the cache, replacing any older entries"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = self.cache_files(paths)
+        for name, path in files.items():
+            table = pa.Table.from_pandas(getattr(self, f'{name}_df'),
+                                         preserve_index=False).combine_chunks()
+            # Written as one batch even when empty, so categorical
+            # dictionaries are stored and the categories survive a reload
+            batch = pa.record_batch([column.chunk(0) for column in table.columns],
+                                    schema=table.schema)
+            # Write beside the target and rename, so readers never see a
+            # partly written file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_batch(batch)
+            os.replace(tmp_path, path)
+        
+        # Drop cache files written for earlier versions of the inputs
+        current = {os.path.basename(path) for path in files.values()}
+        pattern = r'[0-9a-f]{64}_(salesperson|shipment|country|product)\.arrow'
+        for entry in os.listdir(self.cache_dir):
+            if re.fullmatch(pattern, entry) and entry not in current:
+                os.remove(os.path.join(self.cache_dir, entry))
+    
     def clean_salesperson_data(self):
         """Clean and preprocess salesperson data"""
-        print("Cleaning SalesPerson data...")
-        df = self.salesperson_df.copy()
+        logger.info("Cleaning SalesPerson data...")
+        df = self.salesperson_df
         
         # Remove empty rows
         df = df.dropna(how='all')
         
         # Strip whitespace from all string columns
-        df['Sales Person'] = df['Sales Person'].str.strip()
-        df['Team'] = df['Team'].str.strip()
+        df = strip_whitespace(df, ['Sales Person', 'Team'])
         
         # Validate picture URLs
         df['Picture'] = df['Picture'].fillna('')
         
         self.salesperson_df = df
-        print(f"✓ SalesPerson: {len(df)} records cleaned\n")
+        logger.info(f"✓ SalesPerson: {len(df)} records cleaned")
         return df
     
     def clean_shipment_data(self):
         """Clean and preprocess shipment data"""
-        print("Cleaning Shipment data...")
-        df = self.shipment_df.copy()
+        logger.info("Cleaning Shipment data...")
+        df = self.shipment_df
         
-        # Convert date columns to datetime
-        df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y')
-        df['Delivered On'] = pd.to_datetime(df['Delivered On'], format='%d/%m/%Y', errors='coerce')
+        # Date is parsed by Arrow on load; Delivered On is only inferred as a
+        # timestamp when every value parses, so coerce any leftovers here.
+        # Shipment dates repeat heavily, so only distinct strings are parsed
+        if not pd.api.types.is_datetime64_any_dtype(df['Delivered On']):
+            df['Delivered On'] = parse_dates(df['Delivered On'], '%d/%m/%Y')
+        # Same nanosecond Arrow type as Date, whichever way it was parsed
+        df['Delivered On'] = df['Delivered On'].astype(pd.ArrowDtype(pa.timestamp('ns')))
         
         # Strip whitespace from string columns
-        df['Sales Person'] = df['Sales Person'].str.strip()
-        df['Geography'] = df['Geography'].str.strip()
-        df['Product'] = df['Product'].str.strip()
-        df['Status'] = df['Status'].str.strip()
-        
-        # Create additional time features
-        df['Year'] = df['Date'].dt.year
-        df['Month'] = df['Date'].dt.month
-        df['Month Name'] = df['Date'].dt.strftime('%b')
-        df['Quarter'] = df['Date'].dt.quarter
-        df['Weekday'] = df['Date'].dt.day_name()
-        df['Week'] = df['Date'].dt.isocalendar().week
-        
-        # Calculate delivery time (days)
-        df['Delivery Time'] = (df['Delivered On'] - df['Date']).dt.days
-        df['Delivery Time'] = df['Delivery Time'].fillna(0)
+        df = strip_whitespace(df, ['Sales Person', 'Geography', 'Product', 'Status'])
+        
+        # Create additional time features with calendar arithmetic on the
+        # day numbers, assigned in one go. The arithmetic turns a missing
+        # Date into ordinary-looking numbers, so those rows are masked out
+        dates = df['Date'].to_numpy(dtype='datetime64[ns]')
+        days = dates.astype('datetime64[D]')
+        missing = np.isnat(days)
+        months = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        # ISO week: the week's Thursday decides which year it belongs to
+        thursdays = days - weekdays + 3
+        iso_weeks = (thursdays - thursdays.astype('datetime64[Y]')).astype(np.int64) // 7 + 1
+        
+        def nullable(values):
+            return pd.arrays.IntegerArray(np.where(missing, 0, values).astype(np.int32), missing)
+        
+        df = df.assign(**{
+            'Year': nullable(days.astype('datetime64[Y]').astype(np.int64) + 1970),
+            'Month': nullable(months),
+            'Month Name': pd.Categorical.from_codes(np.where(missing, -1, months - 1),
+                                                    categories=MONTH_NAMES),
+            'Quarter': nullable((months - 1) // 3 + 1),
+            'Weekday': pd.Categorical.from_codes(np.where(missing, -1, weekdays),
+                                                 categories=WEEKDAY_NAMES),
+            'Week': nullable(iso_weeks)
+        })
+        
+        # Calculate delivery time (days), 0 when not yet delivered or undated
+        delivered = df['Delivered On'].to_numpy(dtype='datetime64[ns]')
+        df['Delivery Time'] = delivery_days(
+            delivered.view('i8'), dates.view('i8'), np.iinfo(np.int64).min
+        )
         
         # Flag late deliveries (assuming >15 days is late)
         df['Is Late'] = df['Delivery Time'] > 15
         
-        # Create status categories
-        df['Is Active'] = df['Status'] == 'Active'
-        df['Is Completed'] = df['Status'] == 'Completed'
-        df['Is Returned'] = df['Status'] == 'Returned'
+        # Encode status once and derive the flags from the category codes
+        status = encode_status(df['Status'])
+        codes = status.codes
+        df['Status'] = status
+        df['Is Active'] = codes == 0
+        df['Is Completed'] = codes == 1
+        df['Is Returned'] = codes == 2
         
         self.shipment_df = df
-        print(f"✓ Shipment: {len(df)} records cleaned\n")
+        logger.info(f"✓ Shipment: {len(df)} records cleaned")
         return df
     
     def clean_country_data(self):
         """Clean and preprocess country data"""
-        print("Cleaning Country data...")
-        df = self.country_df.copy()
+        logger.info("Cleaning Country data...")
+        df = self.country_df
         
         # Strip whitespace
-        df['Geography'] = df['Geography'].str.strip()
-        df['Region'] = df['Region'].str.strip()
+        df = strip_whitespace(df, ['Geography', 'Region'])
         
         self.country_df = df
-        print(f"✓ Country: {len(df)} records cleaned\n")
+        logger.info(f"✓ Country: {len(df)} records cleaned")
         return df
     
     def clean_product_data(self):
         """Clean and preprocess product data"""
-        print("Cleaning Product data...")
-        df = self.product_df.copy()
+        logger.info("Cleaning Product data...")
+        df = self.product_df
         
         # Strip whitespace
-        df['Product'] = df['Product'].str.strip()
-        df['Category'] = df['Category'].str.strip()
+        df = strip_whitespace(df, ['Product', 'Category'])
         
         # Ensure cost is numeric
         df['Cost per Box'] = pd.to_numeric(df['Cost per Box'], errors='coerce')
         
         self.product_df = df
-        print(f"✓ Product: {len(df)} records cleaned\n")
+        logger.info(f"✓ Product: {len(df)} records cleaned")
         return df
     
     def create_master_dataset(self):
         """Merge all datasets into a master dataset"""
-        print("Creating master dataset...")
+        logger.info("Creating master dataset...")
         
-        # Start with shipment data
-        master = self.shipment_df.copy()
+        # Collect the columns first and build the DataFrame once at the end,
+        # rather than growing it column by column
+        columns = dict(self.shipment_df.items())
         
-        # Merge with salesperson
-        master = master.merge(
-            self.salesperson_df,
-            on='Sales Person',
-            how='left'
-        )
-        
-        # Merge with country
-        master = master.merge(
-            self.country_df,
-            on='Geography',
-            how='left'
-        )
-        
-        # Merge with product
-        master = master.merge(
-            self.product_df,
-            on='Product',
-            how='left'
-        )
+        # Join keys become categoricals so lookups work on their codes
+        join_keys = ['Sales Person', 'Geography', 'Product']
+        for key in join_keys:
+            columns[key] = pd.Categorical(columns[key])
         
-        # Calculate revenue (Sales * Cost per Box)
-        master['Revenue'] = master['Sales'] * master['Cost per Box']
+        # Add salesperson, country and product details by looking up each
+        # key's row in the reference tables instead of merging
+        for lookup_df, key in zip(
+            [self.salesperson_df, self.country_df, self.product_df], join_keys
+        ):
+            columns.update(lookup_columns(columns[key], lookup_df, key))
         
-        # Create profit margin (assuming 30% margin)
-        master['Profit'] = master['Revenue'] * 0.30
+        # Revenue and Profit are derived from Sales and Cost per Box on
+        # demand (see add_revenue_profit) rather than stored here
+        master = pd.DataFrame(columns, index=self.shipment_df.index, copy=False)
         
-        print(f"✓ Master dataset created: {len(master)} records\n")
+        logger.info(f"✓ Master dataset created: {len(master)} records")
         return master
     
     def create_aggregated_tables(self, master_df):
         """Create aggregated tables for Power BI"""
-        print("Creating aggregated tables...")
+        logger.info("Creating aggregated tables...")
+        
+        # Aggregate the master table once into cells of every dimension used
+        # below; each summary is then a cheap roll-up of those cells. Missing
+        # keys are kept here so rows without e.g. a Team still count monthly
+        cell_keys = ['Year', 'Month', 'Month Name', 'Sales Person', 'Team',
+                     'Geography', 'Region', 'Product', 'Category', 'Status']
+        def values(col):
+            return col.to_numpy(np.float64, na_value=np.nan)
+        
+        # Revenue is computed on the fly, and profit follows from the summed
+        # revenue, so neither has to be stored on the master table
+        sales = values(master_df['Sales'])
+        sum_columns = {
+            'Total Sales': sales,
+            'Total Revenue': sales * values(master_df['Cost per Box']),
+            'Shipment Count': values(master_df['Shipment ID'].notna()),
+            'Completed Count': values(master_df['Is Completed']),
+            'Delivery Time Sum': values(master_df['Delivery Time']),
+            'Delivery Time Count': values(master_df['Delivery Time'].notna())
+        }
+        group_ids, first_rows = factorize_keys(master_df, cell_keys)
+        sums = grouped_sums(group_ids, len(first_rows),
+                            np.column_stack(list(sum_columns.values())), get_num_threads())
+        cells = master_df[cell_keys].take(first_rows).reset_index(drop=True)
+        for i, name in enumerate(sum_columns):
+            cells[name] = sums[:, i]
+        cells['Total Profit'] = cells['Total Revenue'] * PROFIT_MARGIN
+        count_columns = ['Shipment Count', 'Completed Count', 'Delivery Time Count']
+        cells[count_columns] = cells[count_columns].astype(np.int64)
+        
+        def rollup(keys, columns):
+            agg = cells.groupby(keys, observed=True)[[
+                'Total Sales', 'Total Revenue', 'Total Profit', 'Shipment Count',
+                'Completed Count', 'Delivery Time Sum', 'Delivery Time Count'
+            ]].sum().reset_index()
+            agg['Avg Delivery Time'] = agg['Delivery Time Sum'] / agg['Delivery Time Count']
+            return agg[keys + columns]
         
         # Monthly aggregation
-        monthly_agg = master_df.groupby(['Year', 'Month', 'Month Name']).agg({
-            'Sales': 'sum',
-            'Revenue': 'sum',
-            'Profit': 'sum',
-            'Shipment ID': 'count',
-            'Delivery Time': 'mean'
-        }).reset_index()
-        monthly_agg.columns = ['Year', 'Month', 'Month Name', 'Total Sales', 
-                               'Total Revenue', 'Total Profit', 'Shipment Count', 
-                               'Avg Delivery Time']
+        monthly_agg = rollup(['Year', 'Month', 'Month Name'], [
+            'Total Sales', 'Total Revenue', 'Total Profit', 'Shipment Count',
+            'Avg Delivery Time'
+        ])
         
         # Sales person performance
-        salesperson_agg = master_df.groupby(['Sales Person', 'Team']).agg({
-            'Sales': 'sum',
-            'Revenue': 'sum',
-            'Shipment ID': 'count',
-            'Delivery Time': 'mean',
-            'Is Completed': 'sum'
-        }).reset_index()
-        salesperson_agg.columns = ['Sales Person', 'Team', 'Total Sales', 
-                                   'Total Revenue', 'Shipment Count', 
-                                   'Avg Delivery Time', 'Completed Count']
+        salesperson_agg = rollup(['Sales Person', 'Team'], [
+            'Total Sales', 'Total Revenue', 'Shipment Count',
+            'Avg Delivery Time', 'Completed Count'
+        ])
         
         # Geography performance
-        geography_agg = master_df.groupby(['Geography', 'Region']).agg({
-            'Sales': 'sum',
-            'Revenue': 'sum',
-            'Shipment ID': 'count',
-            'Delivery Time': 'mean'
-        }).reset_index()
-        geography_agg.columns = ['Geography', 'Region', 'Total Sales', 
-                                'Total Revenue', 'Shipment Count', 
-                                'Avg Delivery Time']
+        geography_agg = rollup(['Geography', 'Region'], [
+            'Total Sales', 'Total Revenue', 'Shipment Count', 'Avg Delivery Time'
+        ])
         
         # Product performance
-        product_agg = master_df.groupby(['Product', 'Category']).agg({
-            'Sales': 'sum',
-            'Revenue': 'sum',
-            'Shipment ID': 'count',
-            'Delivery Time': 'mean'
-        }).reset_index()
-        product_agg.columns = ['Product', 'Category', 'Total Sales', 
-                              'Total Revenue', 'Shipment Count', 
-                              'Avg Delivery Time']
-        
-        # Status summary
-        status_agg = master_df.groupby('Status').agg({
-            'Shipment ID': 'count',
-            'Sales': 'sum',
-            'Revenue': 'sum'
-        }).reset_index()
-        status_agg.columns = ['Status', 'Shipment Count', 'Total Sales', 'Total Revenue']
-        
-        print("✓ Aggregated tables created\n")
+        product_agg = rollup(['Product', 'Category'], [
+            'Total Sales', 'Total Revenue', 'Shipment Count', 'Avg Delivery Time'
+        ])
+        
+        # Status summary; sorted by label, not by the category order
+        status_agg = rollup(['Status'], [
+            'Shipment Count', 'Total Sales', 'Total Revenue'
+        ]).sort_values('Status', key=lambda s: s.astype(str), ignore_index=True)
+        
+        logger.info("✓ Aggregated tables created")
         
         return {
             'monthly': monthly_agg,
@@ -219,86 +561,267 @@ class PowerBIDataPreprocessor:
     
     def validate_data_quality(self, df):
         """Validate data quality and print report"""
-        print("\n" + "="*60)
-        print("DATA QUALITY REPORT")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("DATA QUALITY REPORT")
+        logger.info("="*60)
         
-        print(f"\nTotal Records: {len(df)}")
-        print(f"Total Columns: {len(df.columns)}")
+        logger.info(f"Total Records: {len(df)}")
+        logger.info(f"Total Columns: {len(df.columns)}")
         
         # Missing values
-        print("\nMissing Values:")
-        missing = df.isnull().sum()
+        logger.info("Missing Values:")
+        missing = null_counts(df)
         missing = missing[missing > 0]
         if len(missing) > 0:
             for col, count in missing.items():
-                print(f"  - {col}: {count} ({count/len(df)*100:.2f}%)")
+                logger.info(f"  - {col}: {count} ({count/len(df)*100:.2f}%)")
         else:
-            print("  ✓ No missing values")
+            logger.info("  ✓ No missing values")
         
-        # Duplicate records
-        duplicates = df.duplicated(subset=['Shipment ID']).sum()
-        print(f"\nDuplicate Shipment IDs: {duplicates}")
+        # Duplicate records: after sorting, duplicates sit next to each other
+        ids = pa.array(df['Shipment ID']).drop_null()
+        ids = ids.take(pc.array_sort_indices(ids))
+        duplicates = 0
+        if len(ids) > 1:
+            duplicates = pc.sum(pc.equal(ids[1:], ids[:-1])).as_py()
+        logger.info(f"Duplicate Shipment IDs: {duplicates}")
         
         # Data ranges
-        print("\nData Ranges:")
-        print(f"  - Date Range: {df['Date'].min()} to {df['Date'].max()}")
-        print(f"  - Sales Range: ${df['Sales'].min():.2f} to ${df['Sales'].max():.2f}")
-        print(f"  - Avg Sales: ${df['Sales'].mean():.2f}")
-        
-        # Status distribution
-        print("\nStatus Distribution:")
-        status_dist = df['Status'].value_counts()
-        for status, count in status_dist.items():
-            print(f"  - {status}: {count} ({count/len(df)*100:.2f}%)")
-        
-        print("\n" + "="*60 + "\n")
+        sales_min, sales_max, sales_sum, sales_nan = column_stats(
+            df['Sales'].to_numpy(np.float64, na_value=np.nan)
+        )
+        logger.info("Data Ranges:")
+        logger.info(f"  - Date Range: {df['Date'].min()} to {df['Date'].max()}")
+        logger.info(f"  - Sales Range: ${sales_min:.2f} to ${sales_max:.2f}")
+        sales_count = len(df) - sales_nan
+        sales_avg = sales_sum / sales_count if sales_count else np.nan
+        logger.info(f"  - Avg Sales: ${sales_avg:.2f}")
+        
+        # Status distribution, counted from the category codes
+        logger.info("Status Distribution:")
+        status = pd.Categorical(df['Status'])
+        counts = np.bincount(status.codes[status.codes >= 0], minlength=len(status.categories))
+        for i in np.argsort(-counts, kind='stable'):
+            if counts[i] > 0:
+                logger.info(f"  - {status.categories[i]}: {counts[i]} ({counts[i]/len(df)*100:.2f}%)")
+        
+        logger.info("="*60)
     
-    def export_data(self, master_df, aggregated_tables, output_dir='./processed_data/'):
-        """Export all processed data"""
-        print("Exporting processed data...")
+    def export_data(self, master_df, aggregated_tables, output_dir='./processed_data/',
+                    formats=('csv', 'parquet')):
+        """Export all processed data as CSV and/or Parquet"""
+        logger.info("Exporting processed data...")
         
-        import os
         os.makedirs(output_dir, exist_ok=True)
+        extensions = ', '.join(formats)
+        
+        # Arrow releases the GIL while encoding, so write the files concurrently
+        with ThreadPoolExecutor() as ex:
+            # Export master dataset
+            master = ex.submit(write_table, master_df, f'{output_dir}master_dataset', formats)
+            
+            # Export individual cleaned tables
+            cleaned = [
+                ex.submit(write_table, df, f'{output_dir}{name}_cleaned', formats)
+                for name, df in [('salesperson', self.salesperson_df),
+                                 ('shipment', self.shipment_df),
+                                 ('country', self.country_df),
+                                 ('product', self.product_df)]
+            ]
+            
+            # Export aggregated tables; small row groups let Power BI's
+            # Parquet connector stream them
+            aggregated = {
+                name: ex.submit(write_table, df, f'{output_dir}{name}_aggregated', formats,
+                                row_group_size=64_000)
+                for name, df in aggregated_tables.items()
+            }
+            
+            master.result()
+            logger.info(f"✓ Exported: master_dataset ({extensions})")
+            for future in cleaned:
+                future.result()
+            logger.info(f"✓ Exported: individual cleaned tables ({extensions})")
+            for name, future in aggregated.items():
+                future.result()
+                logger.info(f"✓ Exported: {name}_aggregated ({extensions})")
+        
+        logger.info(f"✓ All files exported to: {output_dir}")
+    
+    def run_lazy_pipeline(self, salesperson_path, shipment_path, country_path, product_path):
+        """Load, clean, merge and aggregate as a single Polars lazy query"""
+        import polars as pl
+        logger.info("Building lazy query plan...")
         
-        # Export master dataset
-        master_df.to_csv(f'{output_dir}master_dataset.csv', index=False)
-        print(f"✓ Exported: master_dataset.csv")
+        def strip(*cols):
+            return [pl.col(col).str.strip_chars() for col in cols]
         
-        # Export individual cleaned tables
-        self.salesperson_df.to_csv(f'{output_dir}salesperson_cleaned.csv', index=False)
-        self.shipment_df.to_csv(f'{output_dir}shipment_cleaned.csv', index=False)
-        self.country_df.to_csv(f'{output_dir}country_cleaned.csv', index=False)
-        self.product_df.to_csv(f'{output_dir}product_cleaned.csv', index=False)
-        print(f"✓ Exported: individual cleaned tables")
+        # Clean individual tables
+        salesperson = (
+            pl.scan_csv(salesperson_path)
+            .filter(~pl.all_horizontal(pl.all().is_null()))
+            .with_columns(*strip('Sales Person', 'Team'), pl.col('Picture').fill_null(''))
+        )
+        country = pl.scan_csv(country_path).with_columns(*strip('Geography', 'Region'))
+        product = pl.scan_csv(product_path).with_columns(
+            *strip('Product', 'Category'),
+            pl.col('Cost per Box').cast(pl.Float64, strict=False)
+        )
         
-        # Export aggregated tables
-        for name, df in aggregated_tables.items():
-            df.to_csv(f'{output_dir}{name}_aggregated.csv', index=False)
-            print(f"✓ Exported: {name}_aggregated.csv")
+        date = pl.col('Date')
+        shipment = (
+            pl.scan_csv(shipment_path, schema_overrides={
+                'Date': pl.String, 'Delivered On': pl.String, 'Sales': pl.Float64
+            })
+            .with_columns(
+                *strip('Sales Person', 'Geography', 'Product', 'Status'),
+                date.str.strptime(pl.Date, '%d/%m/%Y').cast(pl.Datetime('ns')),
+                pl.col('Delivered On').str.strptime(pl.Date, '%d/%m/%Y', strict=False)
+                .cast(pl.Datetime('ns'))
+            )
+            .with_columns(
+                Year=date.dt.year().cast(pl.Int32),
+                Month=date.dt.month().cast(pl.Int32),
+                **{'Month Name': date.dt.strftime('%b').cast(pl.Enum(MONTH_NAMES))},
+                Quarter=date.dt.quarter().cast(pl.Int32),
+                Weekday=date.dt.strftime('%A').cast(pl.Enum(WEEKDAY_NAMES)),
+                Week=date.dt.week().cast(pl.Int32),
+                **{'Delivery Time': (pl.col('Delivered On') - date).dt.total_days()
+                   .fill_null(0).cast(pl.Int32)}
+            )
+            .with_columns(**{
+                'Is Late': pl.col('Delivery Time') > 15,
+                'Is Active': (pl.col('Status') == 'Active').fill_null(False),
+                'Is Completed': (pl.col('Status') == 'Completed').fill_null(False),
+                'Is Returned': (pl.col('Status') == 'Returned').fill_null(False)
+            })
+        )
         
-        print(f"\n✓ All files exported to: {output_dir}\n")
+        # Create master dataset; the first row wins for a repeated lookup key
+        master = shipment
+        for lookup, key in [(salesperson, 'Sales Person'), (country, 'Geography'),
+                            (product, 'Product')]:
+            master = master.join(
+                lookup.unique(subset=key, keep='first', maintain_order=True),
+                on=key, how='left', maintain_order='left'
+            )
+        
+        # Create aggregated tables, with revenue computed inside the
+        # aggregation; groups with a missing key are dropped like in pandas
+        revenue = (pl.col('Sales') * pl.col('Cost per Box')).sum()
+        
+        def aggregate(keys, *aggs):
+            return (
+                master.filter(pl.all_horizontal(pl.col(keys).is_not_null()))
+                .group_by(keys)
+                .agg(*aggs)
+                .sort(keys)
+            )
+        
+        sales = pl.col('Sales').sum().alias('Total Sales')
+        count = pl.col('Shipment ID').count().alias('Shipment Count')
+        delivery = pl.col('Delivery Time').mean().alias('Avg Delivery Time')
+        aggregated = {
+            'monthly': aggregate(['Year', 'Month', 'Month Name'],
+                                 sales, revenue.alias('Total Revenue'),
+                                 (revenue * PROFIT_MARGIN).alias('Total Profit'),
+                                 count, delivery),
+            'salesperson': aggregate(['Sales Person', 'Team'],
+                                     sales, revenue.alias('Total Revenue'), count, delivery,
+                                     pl.col('Is Completed').sum().alias('Completed Count')),
+            'geography': aggregate(['Geography', 'Region'],
+                                   sales, revenue.alias('Total Revenue'), count, delivery),
+            'product': aggregate(['Product', 'Category'],
+                                 sales, revenue.alias('Total Revenue'), count, delivery),
+            'status': aggregate(['Status'], count, sales, revenue.alias('Total Revenue'))
+        }
+        
+        # Run the whole plan at once so the scans and joins are shared
+        results = [
+            arrow_to_pandas(df.to_arrow())
+            for df in pl.collect_all([salesperson, shipment, country, product, master,
+                                      *aggregated.values()])
+        ]
+        self.salesperson_df, self.country_df, self.product_df = results[0], results[2], results[3]
+        
+        # Give the derived columns the pandas engine's dtypes
+        feature_dtypes = {
+            'Year': 'Int32', 'Month': 'Int32', 'Quarter': 'Int32', 'Week': 'Int32',
+            'Delivery Time': np.int32, 'Is Late': bool, 'Is Active': bool,
+            'Is Completed': bool, 'Is Returned': bool,
+            'Month Name': pd.CategoricalDtype(MONTH_NAMES),
+            'Weekday': pd.CategoricalDtype(WEEKDAY_NAMES)
+        }
+        self.shipment_df = results[1].astype(feature_dtypes)
+        self.shipment_df['Status'] = encode_status(self.shipment_df['Status'])
+        master_df = results[4].astype(feature_dtypes)
+        for key in ['Sales Person', 'Geography', 'Product']:
+            master_df[key] = pd.Categorical(master_df[key])
+        master_df['Status'] = encode_status(master_df['Status'])
+        
+        aggregated_tables = {}
+        for name, df in zip(aggregated, results[5:]):
+            aggregated_tables[name] = df.astype({
+                col: master_df[col].dtype if col in master_df
+                else np.int64 if col.endswith('Count') else np.float64
+                for col in df.columns
+            })
+        
+        logger.info(f"✓ Master dataset created: {len(master_df)} records")
+        return master_df, aggregated_tables
+    
+    def choose_engine(self, shipment_path):
+        """Pick the Polars engine for large shipment files when it is installed"""
+        import importlib.util
+        if os.path.getsize(shipment_path) < LARGE_SHIPMENT_BYTES:
+            return 'pandas'
+        if importlib.util.find_spec('polars') is None:
+            logger.warning("Large shipment file but polars is not installed; using pandas")
+            return 'pandas'
+        return 'polars'
     
     def run_pipeline(self, salesperson_path, shipment_path, country_path, product_path):
         """Run the complete preprocessing pipeline"""
-        print("\n" + "="*60)
-        print("POWER BI DATA PREPROCESSING PIPELINE")
-        print("="*60 + "\n")
-        
-        # Load data
-        self.load_data(salesperson_path, shipment_path, country_path, product_path)
-        
-        # Clean individual tables
-        self.clean_salesperson_data()
-        self.clean_shipment_data()
-        self.clean_country_data()
-        self.clean_product_data()
-        
-        # Create master dataset
-        master_df = self.create_master_dataset()
-        
-        # Create aggregated tables
-        aggregated_tables = self.create_aggregated_tables(master_df)
+        logger.info("="*60)
+        logger.info("POWER BI DATA PREPROCESSING PIPELINE")
+        logger.info("="*60)
+        
+        engine = self.engine
+        if engine == 'auto':
+            engine = self.choose_engine(shipment_path)
+        logger.info(f"Engine: {engine}")
+        
+        if engine == 'polars':
+            if self.cache_dir:
+                logger.warning("cache_dir is ignored by the polars engine")
+            master_df, aggregated_tables = self.run_lazy_pipeline(
+                salesperson_path, shipment_path, country_path, product_path
+            )
+        else:
+            # Load and clean data, unless the inputs are unchanged since a
+            # cached run
+            paths = [salesperson_path, shipment_path, country_path, product_path]
+            if not (self.cache_dir and self.load_cached_data(paths)):
+                # Load data
+                self.load_data(*paths)
+                
+                # Clean individual tables
+                self.clean_salesperson_data()
+                self.clean_shipment_data()
+                self.clean_country_data()
+                self.clean_product_data()
+                
+                if self.cache_dir:
+                    self.store_cached_data(paths)
+            
+            # Create master dataset
+            master_df = self.create_master_dataset()
+            
+            # Create aggregated tables
+            aggregated_tables = self.create_aggregated_tables(master_df)
+        
+        # Materialize Revenue and Profit for the report and the exported files
+        master_df = add_revenue_profit(master_df)
         
         # Validate data quality
         self.validate_data_quality(master_df)
@@ -306,15 +829,17 @@ class PowerBIDataPreprocessor:
         # Export data
         self.export_data(master_df, aggregated_tables)
         
-        print("="*60)
-        print("PIPELINE COMPLETED SUCCESSFULLY!")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("PIPELINE COMPLETED SUCCESSFULLY!")
+        logger.info("="*60)
         
         return master_df, aggregated_tables
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Initialize preprocessor
     preprocessor = PowerBIDataPreprocessor()
     